@@ -0,0 +1,122 @@
+"""
+Server-side micro-batching of model inference for the VEXO API
+"""
+
+import asyncio
+
+import numpy as np
+from starlette.concurrency import run_in_threadpool
+
+from normalize import scale_images
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent single-image predictions into batched model calls
+
+    Requests are queued with their future; a single consumer task waits for
+    up to max_delay_ms after the first queued image, collects at most
+    max_batch_size images and scores them with one call to predict_fn.
+
+    Images are queued as resized uint8 BGR pixels. On the threadpool they are
+    scaled to Xception's [-1, 1] range with normalize.scale_images, directly
+    into a float32 batch buffer allocated once at start, so no per-request
+    float arrays are created.
+    """
+
+    def __init__(self, predict_fn, max_batch_size: int = 16, max_delay_ms: float = 5.0):
+        """
+        Initialize the batcher
+
+        Args:
+            predict_fn: Function scoring a preprocessed (N, 299, 299, 3) float32
+                batch, returning N scores
+            max_batch_size: Maximum number of images per model call
+            max_delay_ms: Maximum time to wait for more images after the first
+        """
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay_ms / 1000.0
+        self._queue = None
+        self._task = None
+        self._batch_buf = None
+
+    def start(self):
+        """Allocate the batch buffer and start the consumer task on the running event loop"""
+        # Only the consumer task writes to the buffer, one batch at a time
+        self._batch_buf = np.empty((self.max_batch_size, 299, 299, 3), dtype=np.float32)
+        # Start numba's thread pool here rather than from a worker thread,
+        # which can leave the TBB layer hanging at interpreter exit
+        scale_images(np.zeros((1, 299, 299, 3), dtype=np.uint8), out=self._batch_buf[:1])
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Cancel the consumer task"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def predict(self, image: np.ndarray) -> float:
+        """
+        Queue one resized (299, 299, 3) uint8 BGR image and wait for its score
+
+        Args:
+            image: Resized image pixels
+
+        Returns:
+            float: Validity score
+        """
+        if self._queue is None:
+            raise RuntimeError("Inference batcher not started")
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((image, future))
+        return await future
+
+    async def _collect(self):
+        """Wait for the first image, then gather more until full or timed out"""
+        items = [await self._queue.get()]
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_delay
+        while len(items) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return items
+
+    def _predict(self, images):
+        """Scale queued images into the batch buffer and score them"""
+        batch = self._batch_buf[: len(images)]
+        scale_images(np.stack(images), out=batch)
+        return self.predict_fn(batch)
+
+    async def _run(self):
+        """Consumer loop scoring one batch at a time"""
+        while True:
+            items = await self._collect()
+            futures = [future for _, future in items]
+
+            try:
+                images = [image for image, _ in items]
+                # Keep the event loop free while the batch is scaled and scored
+                scores = await run_in_threadpool(self._predict, images)
+            except Exception as e:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for future, score in zip(futures, scores):
+                if not future.done():
+                    future.set_result(float(score))
@@ -0,0 +1,51 @@
+"""
+Reusable numpy buffer pools for the VEXO API hot paths
+"""
+
+import queue
+from contextlib import contextmanager
+
+import numpy as np
+
+
+class NpPool:
+    """
+    Pool of same-shape numpy arrays reused across requests
+
+    Arrays are allocated on first use and up to size idle arrays are kept;
+    when the pool is empty a fresh array is allocated instead of blocking.
+    """
+
+    def __init__(self, shape, dtype, size: int):
+        """
+        Initialize the pool
+
+        Args:
+            shape: Shape of every pooled array
+            dtype: Data type of every pooled array
+            size: Maximum number of idle arrays kept for reuse
+        """
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self._arrays: queue.LifoQueue = queue.LifoQueue(maxsize=size)
+
+    @contextmanager
+    def borrow(self):
+        """
+        Borrow an array from the pool and return it when done
+
+        The array's contents are left over from its previous user, so callers
+        must overwrite it completely before reading.
+        """
+        try:
+            array = self._arrays.get_nowait()
+        except queue.Empty:
+            array = np.empty(self.shape, dtype=self.dtype)
+
+        try:
+            yield array
+        finally:
+            try:
+                self._arrays.put_nowait(array)
+            except queue.Full:
+                pass
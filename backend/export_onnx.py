@@ -0,0 +1,123 @@
+"""
+Export the Xception feature extractor and the classification head to
+8-bit quantized ONNX models, plus an int8 TFLite build of the head
+Run this once offline; main.py picks up the quantized models at startup
+"""
+
+import os
+import sys
+
+
+def convert_to_onnx(model, input_signature, output_path):
+    """
+    Convert a Keras model to ONNX by tracing it as a tf.function
+
+    tf2onnx.convert.from_keras cannot resolve Keras 3 output names, so the
+    model's inference call is converted instead.
+    """
+    import tensorflow as tf
+    import tf2onnx
+
+    @tf.function(input_signature=input_signature)
+    def forward(x):
+        return model(x, training=False)
+
+    tf2onnx.convert.from_function(
+        forward, input_signature=input_signature, output_path=output_path
+    )
+    return output_path
+
+
+def export_xception(output_path="xception.onnx"):
+    """Convert the ImageNet Xception backbone (avg pooling) to ONNX"""
+    import tensorflow as tf
+    from keras.applications.xception import Xception
+
+    print("Loading Xception model...")
+    model = Xception(weights="imagenet", include_top=False, pooling="avg")
+
+    print(f"Converting Xception to ONNX: {output_path}")
+    input_signature = [tf.TensorSpec((None, 299, 299, 3), tf.float32, name="input")]
+    return convert_to_onnx(model, input_signature, output_path)
+
+
+def export_head(model_path="vexo_v4_2.keras", output_path="head.onnx"):
+    """Convert the classification head over 2048-d Xception features to ONNX"""
+    import tensorflow as tf
+    from keras.models import load_model
+
+    print(f"Loading classification model from {model_path}...")
+    model = load_model(model_path)
+
+    print(f"Converting classification head to ONNX: {output_path}")
+    input_signature = [tf.TensorSpec((None, 2048), tf.float32, name="input")]
+    return convert_to_onnx(model, input_signature, output_path)
+
+
+def export_head_tflite(model_path="vexo_v4_2.keras", output_path="head.int8.tflite"):
+    """Convert the classification head to TFLite with int8 dynamic-range weights"""
+    import tensorflow as tf
+    from keras.models import load_model
+
+    print(f"Loading classification model from {model_path}...")
+    model = load_model(model_path)
+
+    @tf.function(input_signature=[tf.TensorSpec((None, 2048), tf.float32)])
+    def head(features):
+        return model(features, training=False)
+
+    print(f"Converting classification head to TFLite: {output_path}")
+    # Without a trackable object the converter freezes the concrete function
+    # itself, capturing the model's variables as constants
+    converter = tf.lite.TFLiteConverter.from_concrete_functions(
+        [head.get_concrete_function()]
+    )
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    with open(output_path, "wb") as f:
+        f.write(converter.convert())
+    return output_path
+
+
+def quantize_model(input_path, output_path):
+    """Apply dynamic 8-bit weight quantization to an ONNX model"""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    # Unsigned weights: older ONNX Runtime CPU builds have no ConvInteger
+    # kernel for int8 weights, which Xception's convolutions would need
+    print(f"Quantizing {input_path} -> {output_path}")
+    quantize_dynamic(input_path, output_path, weight_type=QuantType.QUInt8)
+    return output_path
+
+
+def main():
+    """Export and quantize the Xception backbone and the classification head"""
+    print("🔧 VEXO ONNX Export Tool")
+    print("=" * 60)
+
+    exports = [
+        (export_xception, "xception.int8.onnx"),
+        (export_head, "head.int8.onnx"),
+    ]
+
+    for export, int8_path in exports:
+        try:
+            fp32_path = export()
+            quantize_model(fp32_path, int8_path)
+        except ImportError as e:
+            print(f"❌ Missing dependency: {e}")
+            print("   Install with: pip install tf2onnx onnxruntime")
+            sys.exit(1)
+
+        os.remove(fp32_path)
+        print(f"✅ Saved {int8_path}")
+
+    print(f"✅ Saved {export_head_tflite()}")
+
+    print("Restart the API to use the exported models")
+    print(
+        "Set CLASSIFIER_BACKEND=onnx or CLASSIFIER_BACKEND=tflite to serve the quantized head"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -74,16 +74,17 @@ def check_api_enabled():
 
 
 def clean_token_file():
-    """Remove existing token file to force re-authentication"""
-    token_file = "token.pickle"
+    """Remove existing token files to force re-authentication"""
+    token_files = [f for f in ("token.json", "token.pickle") if os.path.exists(f)]
 
-    if os.path.exists(token_file):
+    for token_file in token_files:
         try:
             os.remove(token_file)
             print(f"✅ Removed {token_file} - will force fresh authentication")
         except Exception as e:
             print(f"❌ Could not remove {token_file}: {e}")
-    else:
+
+    if not token_files:
         print("ℹ️  No existing token file found")
 
 
@@ -3,23 +3,51 @@ Google Drive Authentication and File Processing Module for VEXO API
 """
 
 import os
-import io
+import asyncio
 import json
-import pickle
+import functools
+import re
+import threading
+from datetime import datetime, timedelta, timezone
 from typing import Optional
-from urllib.parse import urlparse, parse_qs
 
-from google.auth.transport.requests import Request
+import httplib2
+from cachetools import LRUCache, TTLCache
+from google_auth_httplib2 import AuthorizedHttp
+from google.auth.transport.requests import AuthorizedSession, Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import Flow, InstalledAppFlow
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.discovery_cache import get_static_doc
 from googleapiclient.errors import HttpError
-from googleapiclient.http import MediaIoBaseDownload
 
-from PIL import Image
 from fastapi import HTTPException
+
 import tempfile
 
+# Matches the file ID in Google Drive and Docs URLs:
+#   https://drive.google.com/file/d/FILE_ID/view
+#   https://drive.google.com/open?id=FILE_ID (also /uc?export=download&id=FILE_ID)
+#   https://docs.google.com/{document,spreadsheets,presentation}/d/FILE_ID/edit
+_FILE_ID_RE = re.compile(
+    r"https?://(?:drive|docs)\.google\.com/"
+    r"(?:(?:file|document|spreadsheets|presentation)/d/|(?:open|uc)\?(?:[^&]+&)*id=)"
+    r"([A-Za-z0-9_-]{10,})"
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _extract_file_id(drive_url: str) -> Optional[str]:
+    """Parse a Google Drive file ID out of a URL (memoized per URL)"""
+    match = _FILE_ID_RE.search(drive_url)
+    return match.group(1) if match else None
+
+
+@functools.lru_cache(maxsize=1)
+def _drive_discovery_document() -> Optional[str]:
+    """Load the Drive v3 discovery document bundled with googleapiclient once"""
+    return get_static_doc("drive", "v3")
+
 
 class GoogleDriveAuth:
     """Google Drive Authentication and File Access Manager"""
@@ -27,22 +55,39 @@ class GoogleDriveAuth:
     # Required scopes for Google Drive API
     SCOPES = ["https://www.googleapis.com/auth/drive.readonly"]
 
+    # Metadata fields requested for every file
+    FILE_INFO_FIELDS = "id,name,mimeType,size,md5Checksum,createdTime,modifiedTime"
+
+    # Maximum number of calls Google accepts in a single batch request
+    MAX_BATCH_SIZE = 100
+
+    # Access tokens closer than this to expiry are refreshed in the background
+    REFRESH_MARGIN = timedelta(minutes=5)
+
     def __init__(
         self,
         credentials_file: str = "credentials.json",
-        token_file: str = "token.pickle",
+        token_file: str = "token.json",
+        legacy_token_file: str = "token.pickle",
     ):
         """
         Initialize Google Drive authentication
 
         Args:
             credentials_file: Path to Google OAuth2 credentials JSON file
-            token_file: Path to store authentication tokens
+            token_file: Path to store authentication tokens (JSON)
+            legacy_token_file: Path of a pickled token from older versions,
+                migrated to token_file on first authentication
         """
         self.credentials_file = credentials_file
         self.token_file = token_file
+        self.legacy_token_file = legacy_token_file
         self.creds = None
         self.service = None
+        self.session = None
+        self._refresh_lock = threading.Lock()
+        # file ID -> (ETag, file information) for conditional metadata requests
+        self._file_info_cache = LRUCache(maxsize=10000)
 
     def authenticate(self) -> bool:
         """
@@ -51,11 +96,19 @@ class GoogleDriveAuth:
         Returns:
             bool: True if authentication successful, False otherwise
         """
+        # Reuse the existing service while its credentials are still valid
+        if self.service and self.creds and self.creds.valid:
+            return True
+
         try:
+            # Convert a token saved by older versions before loading
+            self._migrate_legacy_token()
+
             # Load existing token if available
             if os.path.exists(self.token_file):
-                with open(self.token_file, "rb") as token:
-                    self.creds = pickle.load(token)
+                self.creds = Credentials.from_authorized_user_file(
+                    self.token_file, self.SCOPES
+                )
 
             # If no valid credentials, request user authorization
             if not self.creds or not self.creds.valid:
@@ -86,17 +139,81 @@ class GoogleDriveAuth:
                         raise auth_error
 
                 # Save credentials for next run
-                with open(self.token_file, "wb") as token:
-                    pickle.dump(self.creds, token)
+                self._save_token()
 
-            # Build the service
-            self.service = build("drive", "v3", credentials=self.creds)
+            # Build the service from the cached discovery document
+            discovery_document = _drive_discovery_document()
+            if discovery_document:
+                self.service = build_from_document(
+                    discovery_document, credentials=self.creds
+                )
+            else:
+                self.service = build("drive", "v3", credentials=self.creds)
+            self.session = AuthorizedSession(self.creds)
             return True
 
         except Exception as e:
             print(f"Authentication failed: {str(e)}")
             return False
 
+    def refresh_in_background(self):
+        """
+        Refresh the access token on a background thread when it is about to expire
+
+        Requests keep using the current token meanwhile, so none of them
+        block on the refresh round-trip.
+        """
+        if not self.creds or not self.creds.refresh_token or not self.creds.expiry:
+            return
+
+        # Credentials.expiry is a naive UTC datetime
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        if self.creds.expiry - now > self.REFRESH_MARGIN:
+            return
+
+        if not self._refresh_lock.acquire(blocking=False):
+            return  # A refresh is already running
+
+        def _refresh():
+            try:
+                self.creds.refresh(Request())
+                self._save_token()
+            except Exception as e:
+                print(f"Background token refresh failed: {str(e)}")
+            finally:
+                self._refresh_lock.release()
+
+        threading.Thread(target=_refresh, daemon=True).start()
+
+    def _save_token(self):
+        """Write the current credentials to the JSON token file"""
+        with open(self.token_file, "w") as token:
+            token.write(self.creds.to_json())
+
+    def _migrate_legacy_token(self):
+        """
+        Rewrite a pickled token from older versions as JSON and remove it
+
+        The pickle is only unpickled once, when no JSON token exists yet.
+        """
+        if not os.path.exists(self.legacy_token_file):
+            return
+        if os.path.exists(self.token_file):
+            os.remove(self.legacy_token_file)
+            return
+
+        try:
+            import pickle
+
+            with open(self.legacy_token_file, "rb") as token:
+                self.creds = pickle.load(token)
+            self._save_token()
+            os.remove(self.legacy_token_file)
+            print(f"Migrated {self.legacy_token_file} to {self.token_file}")
+        except Exception as e:
+            print(f"Could not migrate {self.legacy_token_file}: {str(e)}")
+            self.creds = None
+
     def extract_file_id_from_url(self, drive_url: str) -> Optional[str]:
         """
         Extract Google Drive file ID from various URL formats
@@ -108,29 +225,7 @@ class GoogleDriveAuth:
             str: File ID if found, None otherwise
         """
         try:
-            # Parse the URL
-            parsed_url = urlparse(drive_url)
-
-            # Handle different Google Drive URL formats
-            if "drive.google.com" in parsed_url.netloc:
-                # Format: https://drive.google.com/file/d/FILE_ID/view
-                if "/file/d/" in parsed_url.path:
-                    file_id = parsed_url.path.split("/file/d/")[1].split("/")[0]
-                    return file_id
-
-                # Format: https://drive.google.com/open?id=FILE_ID
-                elif "open" in parsed_url.path:
-                    query_params = parse_qs(parsed_url.query)
-                    if "id" in query_params:
-                        return query_params["id"][0]
-
-                # Format: https://docs.google.com/document/d/FILE_ID/edit
-                elif parsed_url.netloc.startswith("docs.google.com"):
-                    if "/d/" in parsed_url.path:
-                        file_id = parsed_url.path.split("/d/")[1].split("/")[0]
-                        return file_id
-
-            return None
+            return _extract_file_id(drive_url)
 
         except Exception as e:
             print(f"Error extracting file ID: {str(e)}")
@@ -140,29 +235,50 @@ class GoogleDriveAuth:
         """
         Get file information from Google Drive
 
+        Files seen before are revalidated with If-None-Match, so an unchanged
+        file is answered from the local cache on a 304 Not Modified.
+
         Args:
             file_id: Google Drive file ID
 
         Returns:
             dict: File information or None if error
         """
+        cached = self._file_info_cache.get(file_id)
+
         try:
             if not self.service:
                 raise RuntimeError("Google Drive service not authenticated")
 
-            file_info = (
-                self.service.files()
-                .get(
-                    fileId=file_id,
-                    fields="id,name,mimeType,size,createdTime,modifiedTime",
-                )
-                .execute()
+            request = self.service.files().get(
+                fileId=file_id,
+                fields=self.FILE_INFO_FIELDS,
             )
+            if cached:
+                request.headers["If-None-Match"] = cached[0]
+
+            # execute() only returns the body, so capture the ETag header
+            # while the response is post-processed
+            response_headers = {}
+            postproc = request.postproc
+
+            def _capture_headers(resp, content):
+                response_headers.update(resp)
+                return postproc(resp, content)
+
+            request.postproc = _capture_headers
+            file_info = request.execute()
+
+            etag = response_headers.get("etag")
+            if etag:
+                self._file_info_cache[file_id] = (etag, file_info)
 
             return file_info
 
         except HttpError as e:
-            if e.resp.status == 404:
+            if e.resp.status == 304 and cached:
+                return cached[1]
+            elif e.resp.status == 404:
                 print(f"File not found: {file_id}")
             elif e.resp.status == 403:
                 print(f"Access denied: {file_id}")
@@ -173,94 +289,119 @@ class GoogleDriveAuth:
             print(f"Error getting file info: {str(e)}")
             return None
 
-    def download_file(self, file_id: str) -> Optional[bytes]:
+    def get_file_info_batch(self, file_ids: list[str]) -> dict[str, Optional[dict]]:
         """
-        Download file content from Google Drive
+        Get file information for many files using Google Drive batch requests
+
+        Up to MAX_BATCH_SIZE metadata calls share one HTTP round-trip. This
+        runs on a worker thread, so the batches go over their own HTTP client
+        instead of the service's, which is not thread-safe.
 
         Args:
-            file_id: Google Drive file ID
+            file_ids: Google Drive file IDs
 
         Returns:
-            bytes: File content or None if error
+            dict: File information keyed by file ID, None for files that failed
         """
-        try:
-            if not self.service:
-                raise RuntimeError("Google Drive service not authenticated")
+        if not self.service:
+            raise RuntimeError("Google Drive service not authenticated")
 
-            # Get file info first to check if it's an image
-            file_info = self.get_file_info(file_id)
-            if not file_info:
-                return None
+        file_infos = {}
 
-            # Check if file is an image
-            mime_type = file_info.get("mimeType", "")
-            if not mime_type.startswith("image/"):
-                raise ValueError(f"File is not an image. MIME type: {mime_type}")
-
-            # Download the file
-            request = self.service.files().get_media(fileId=file_id)
-            file_io = io.BytesIO()
-            downloader = MediaIoBaseDownload(file_io, request)
-
-            done = False
-            while done is False:
-                status, done = downloader.next_chunk()
-                if status:
-                    print(f"Download progress: {int(status.progress() * 100)}%")
-
-            file_io.seek(0)
-            return file_io.getvalue()
-
-        except HttpError as e:
-            if e.resp.status == 404:
-                print(f"File not found: {file_id}")
-            elif e.resp.status == 403:
-                print(f"Access denied to file: {file_id}")
+        def _callback(request_id, response, exception):
+            if exception is not None:
+                print(f"Error getting file info for {request_id}: {exception}")
+                file_infos[request_id] = None
             else:
-                print(f"HTTP Error downloading file: {e}")
-            return None
-        except Exception as e:
-            print(f"Error downloading file: {str(e)}")
-            return None
+                file_infos[request_id] = response
+
+        http = AuthorizedHttp(self.creds, http=httplib2.Http())
+
+        # Batch request IDs must be unique
+        unique_ids = list(dict.fromkeys(file_ids))
+        for start in range(0, len(unique_ids), self.MAX_BATCH_SIZE):
+            batch = self.service.new_batch_http_request(callback=_callback)
+            for file_id in unique_ids[start : start + self.MAX_BATCH_SIZE]:
+                batch.add(
+                    self.service.files().get(
+                        fileId=file_id, fields=self.FILE_INFO_FIELDS
+                    ),
+                    request_id=file_id,
+                )
+            batch.execute(http=http)
+
+        return file_infos
 
-    def download_image_from_url(self, drive_url: str) -> Optional[Image.Image]:
+    def read_image_bytes(self, file_id: str, max_bytes: Optional[int] = None) -> bytes:
         """
-        Download and return PIL Image from Google Drive URL
+        Download file content from Google Drive over the authorized session
+
+        The body is read into memory in a single capped read, so a file
+        larger than max_bytes is rejected after reading at most one byte
+        past the limit.
 
         Args:
-            drive_url: Google Drive URL
+            file_id: Google Drive file ID
+            max_bytes: Optional maximum size of the downloaded content
 
         Returns:
-            PIL.Image: Downloaded image or None if error
+            bytes: File content
         """
-        try:
-            # Extract file ID from URL
-            file_id = self.extract_file_id_from_url(drive_url)
-            if not file_id:
-                raise ValueError("Could not extract file ID from URL")
-
-            # Download file content
-            file_content = self.download_file(file_id)
-            if not file_content:
-                return None
+        if not self.session:
+            raise RuntimeError("Google Drive service not authenticated")
+
+        with self.session.get(
+            f"https://www.googleapis.com/drive/v3/files/{file_id}",
+            params={"alt": "media"},
+            stream=True,
+        ) as response:
+            if response.status_code == 404:
+                raise ValueError(f"File not found: {file_id}")
+            elif response.status_code == 403:
+                raise ValueError(f"Access denied to file: {file_id}")
+            response.raise_for_status()
+
+            if max_bytes is None:
+                return response.raw.read(decode_content=True)
+
+            content = response.raw.read(max_bytes + 1, decode_content=True)
+            if len(content) > max_bytes:
+                raise ValueError(file_too_large_message(max_bytes))
+            return content
+
+    def download_image(
+        self, file_id: str, file_info: dict, max_bytes: Optional[int] = None
+    ) -> bytes:
+        """
+        Download an image whose metadata has already been fetched
 
-            # Convert to PIL Image
-            image = Image.open(io.BytesIO(file_content))
+        The encoded file is returned as is, so it is decoded the same way as
+        an uploaded file with the same content.
 
-            # Convert to RGB if necessary
-            if image.mode != "RGB":
-                image = image.convert("RGB")
+        Args:
+            file_id: Google Drive file ID
+            file_info: File information from get_file_info
+            max_bytes: Optional maximum size of the image file
 
-            return image
+        Returns:
+            bytes: Encoded image file content
+        """
+        # Check if file is an image
+        mime_type = file_info.get("mimeType", "")
+        if not mime_type.startswith("image/"):
+            raise ValueError(f"File is not an image. MIME type: {mime_type}")
+        check_file_size(file_info, max_bytes)
 
-        except Exception as e:
-            print(f"Error downloading image from URL: {str(e)}")
-            return None
+        return self.read_image_bytes(file_id, max_bytes)
 
 
 # Global Google Drive authentication instance
 drive_auth = GoogleDriveAuth()
 
+# (filename, score) per Drive file ID, so repeated URLs skip even the metadata
+# request; entries expire so edited files are eventually re-validated
+drive_result_cache = TTLCache(maxsize=10_000, ttl=3600)
+
 
 def initialize_google_drive_auth() -> bool:
     """
@@ -272,16 +413,51 @@ def initialize_google_drive_auth() -> bool:
     return drive_auth.authenticate()
 
 
+def file_too_large_message(max_bytes: int) -> str:
+    """Build the error message for Drive files larger than max_bytes"""
+    return f"File too large. Maximum size is {max_bytes // (1024 * 1024)} MB"
+
+
+def check_file_size(file_info: dict, max_bytes: Optional[int]):
+    """
+    Reject a file whose size reported by Google Drive exceeds max_bytes
+
+    Args:
+        file_info: File information from get_file_info
+        max_bytes: Maximum accepted size, or None for no limit
+    """
+    size = file_info.get("size")
+    if max_bytes is not None and size is not None and int(size) > max_bytes:
+        raise ValueError(file_too_large_message(max_bytes))
+
+
+def score_cache_key(file_info: dict) -> Optional[str]:
+    """
+    Build a score cache key from the content checksum reported by Google Drive
+
+    Args:
+        file_info: File information from get_file_info
+
+    Returns:
+        str: Cache key, or None if Drive reported no checksum
+    """
+    md5_checksum = file_info.get("md5Checksum")
+    return f"md5:{md5_checksum}" if md5_checksum else None
+
+
 def process_google_drive_image(
-    drive_url: str, extract_features_func, predict_validity_func
+    drive_url: str, predict_image_func, score_cache=None, max_bytes=None
 ) -> dict:
     """
     Process an image from Google Drive URL using VEXO validation functions
 
     Args:
         drive_url: Google Drive URL containing the image
-        extract_features_func: Function to extract features from image
-        predict_validity_func: Function to predict image validity
+        predict_image_func: Function predicting the validity score of an
+            encoded image file
+        score_cache: Optional mapping of content checksums to scores, used to
+            skip downloading and scoring files that were already validated
+        max_bytes: Optional maximum size of the image file
 
     Returns:
         dict: Processing results with validation score and status
@@ -291,41 +467,203 @@ def process_google_drive_image(
         if not drive_auth.service:
             if not drive_auth.authenticate():
                 raise RuntimeError("Failed to authenticate with Google Drive")
+        drive_auth.refresh_in_background()
 
-        # Download image from Google Drive
-        pil_image = drive_auth.download_image_from_url(drive_url)
-        if not pil_image:
-            raise ValueError("Failed to download image from Google Drive")
-
-        # Extract file ID for filename
+        # Extract file ID from URL
         file_id = drive_auth.extract_file_id_from_url(drive_url)
-        file_info = drive_auth.get_file_info(file_id) if file_id else None
-        filename = (
-            file_info.get("name", f"drive_image_{file_id}")
-            if file_info
-            else "drive_image"
-        )
+        if not file_id:
+            raise ValueError("Could not extract file ID from URL")
+
+        cached = drive_result_cache.get(file_id)
+        if cached is not None:
+            return build_drive_result(drive_url, file_id, *cached)
+
+        file_info = drive_auth.get_file_info(file_id)
+        if not file_info:
+            raise ValueError("Failed to get file information from Google Drive")
+
+        filename = file_info.get("name", f"drive_image_{file_id}")
+
+        # Reuse the score of identical content without downloading it again
+        cache_key = score_cache_key(file_info)
+        if score_cache is not None and cache_key in score_cache:
+            drive_result_cache[file_id] = (filename, score_cache[cache_key])
+            return build_drive_result(
+                drive_url, file_id, filename, score_cache[cache_key]
+            )
 
-        # Extract features using provided function
-        features = extract_features_func(pil_image=pil_image)
+        # Download image from Google Drive
+        content = drive_auth.download_image(file_id, file_info, max_bytes)
 
         # Get prediction score using provided function
-        score = predict_validity_func(features)
-
-        # Determine validity
-        is_valid = score >= 0.5
-
-        return {
-            "filename": filename,
-            "file_id": file_id,
-            "drive_url": drive_url,
-            "validity_score": score,
-            "percentage": score * 100,
-            "is_valid": is_valid,
-            "message": "Image is valid" if is_valid else "Image is not valid",
-        }
+        score = predict_image_func(content)
+
+        if score_cache is not None and cache_key:
+            score_cache[cache_key] = score
+        drive_result_cache[file_id] = (filename, score)
+
+        return build_drive_result(drive_url, file_id, filename, score)
 
     except Exception as e:
         raise HTTPException(
             status_code=400, detail=f"Error processing Google Drive image: {str(e)}"
         )
+
+
+async def process_google_drive_images(
+    drive_urls: list[str],
+    predict_images_func,
+    score_cache=None,
+    max_concurrent_downloads: int = 8,
+    max_bytes=None,
+) -> list[dict]:
+    """
+    Process many Google Drive images with batched metadata and concurrent downloads
+
+    Metadata for all URLs is fetched in one batch request, non-images and
+    files over max_bytes are rejected without downloading, and the remaining
+    images are downloaded concurrently and scored together.
+
+    Args:
+        drive_urls: Google Drive URLs containing the images
+        predict_images_func: Function predicting validity scores for a list
+            of encoded image files
+        score_cache: Optional mapping of content checksums to scores, used to
+            skip downloading and scoring files that were already validated
+        max_concurrent_downloads: Maximum number of simultaneous downloads
+        max_bytes: Optional maximum size of each image file
+
+    Returns:
+        list: Processing results (or errors) in the same order as drive_urls
+    """
+    # Authenticate if not already done
+    if not drive_auth.service:
+        if not drive_auth.authenticate():
+            raise RuntimeError("Failed to authenticate with Google Drive")
+    drive_auth.refresh_in_background()
+
+    results = [None] * len(drive_urls)
+
+    def _error(index, message):
+        results[index] = {
+            "drive_url": drive_urls[index],
+            "error": f"Error processing Google Drive image: {message}",
+        }
+
+    # Resolve file IDs and fetch metadata for uncached files in one round-trip
+    file_ids = {}
+    for index, drive_url in enumerate(drive_urls):
+        file_id = drive_auth.extract_file_id_from_url(drive_url)
+        if not file_id:
+            _error(index, "Could not extract file ID from URL")
+            continue
+
+        cached = drive_result_cache.get(file_id)
+        if cached is not None:
+            results[index] = build_drive_result(drive_url, file_id, *cached)
+        else:
+            file_ids[index] = file_id
+
+    file_infos = await asyncio.to_thread(
+        drive_auth.get_file_info_batch, list(file_ids.values())
+    )
+
+    # Skip files that are missing or not images without downloading them
+    pending = {}
+    for index, file_id in file_ids.items():
+        file_info = file_infos.get(file_id)
+        if not file_info:
+            _error(index, "Failed to get file information from Google Drive")
+            continue
+
+        mime_type = file_info.get("mimeType", "")
+        if not mime_type.startswith("image/"):
+            _error(index, f"File is not an image. MIME type: {mime_type}")
+            continue
+
+        try:
+            check_file_size(file_info, max_bytes)
+        except ValueError as e:
+            _error(index, str(e))
+            continue
+
+        cache_key = score_cache_key(file_info)
+        if score_cache is not None and cache_key in score_cache:
+            filename = file_info.get("name", f"drive_image_{file_id}")
+            drive_result_cache[file_id] = (filename, score_cache[cache_key])
+            results[index] = build_drive_result(
+                drive_urls[index], file_id, filename, score_cache[cache_key]
+            )
+            continue
+
+        pending[index] = (file_id, file_info)
+
+    semaphore = asyncio.Semaphore(max_concurrent_downloads)
+
+    async def _download(file_id, file_info):
+        async with semaphore:
+            return await asyncio.to_thread(
+                drive_auth.download_image, file_id, file_info, max_bytes
+            )
+
+    contents = await asyncio.gather(
+        *[_download(file_id, file_info) for file_id, file_info in pending.values()],
+        return_exceptions=True,
+    )
+
+    downloaded = {}
+    for index, content in zip(pending, contents):
+        if isinstance(content, Exception):
+            _error(index, str(content))
+        else:
+            downloaded[index] = content
+
+    if not downloaded:
+        return results
+
+    # Score every downloaded image in batched forward passes
+    try:
+        scores = await asyncio.to_thread(predict_images_func, list(downloaded.values()))
+    except Exception as e:
+        for index in downloaded:
+            _error(index, str(e))
+        return results
+
+    for index, score in zip(downloaded, scores):
+        file_id, file_info = pending[index]
+        cache_key = score_cache_key(file_info)
+        if score_cache is not None and cache_key:
+            score_cache[cache_key] = score
+
+        filename = file_info.get("name", f"drive_image_{file_id}")
+        drive_result_cache[file_id] = (filename, score)
+        results[index] = build_drive_result(drive_urls[index], file_id, filename, score)
+
+    return results
+
+
+def build_drive_result(drive_url: str, file_id: str, filename: str, score) -> dict:
+    """
+    Build the validation response payload for a Google Drive image
+
+    Args:
+        drive_url: Google Drive URL of the image
+        file_id: Google Drive file ID
+        filename: Name of the file in Google Drive
+        score: Validity score predicted for the image
+
+    Returns:
+        dict: Validation score and status
+    """
+    score = float(score)
+    is_valid = score >= 0.5
+
+    return {
+        "filename": filename,
+        "file_id": file_id,
+        "drive_url": drive_url,
+        "validity_score": score,
+        "percentage": score * 100,
+        "is_valid": is_valid,
+        "message": "Image is valid" if is_valid else "Image is not valid",
+    }
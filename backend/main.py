@@ -1,25 +1,62 @@
 import os
+
+# OpenMP reads these when TensorFlow loads, so they must be set before the import
+os.environ.setdefault("OMP_NUM_THREADS", str(os.cpu_count()))
+os.environ.setdefault("KMP_AFFINITY", "granularity=fine,compact,1,0")
+# Let XLA auto-cluster the remaining TensorFlow graphs on GPU (no effect on CPU)
+os.environ.setdefault("TF_XLA_FLAGS", "--tf_xla_auto_jit=2")
+# OpenCV refuses to decode images larger than Pillow's default
+# Image.MAX_IMAGE_PIXELS, even when Pillow cannot parse the header
+os.environ.setdefault("OPENCV_IO_MAX_IMAGE_PIXELS", "89478485")
+
+import asyncio
+import hashlib
+import threading
 import cv2
 import numpy as np
+import tensorflow as tf
+from keras import Input, Model, mixed_precision
 from keras.models import load_model
 from keras.applications.xception import Xception
-from keras.applications.xception import preprocess_input
 from fastapi import FastAPI, File, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 import uvicorn
+from anyio import to_thread
+from starlette.concurrency import run_in_threadpool
 from PIL import Image
+from PIL import features as pil_features
 import io
 from typing import List
+from cachetools import LRUCache
 import pandas as pd
-import base64
+import openpyxl
 from fastapi.responses import StreamingResponse
-import tempfile
 import zipfile
 from pydantic import BaseModel
 
+# pybase64 is an optional SIMD drop-in for the standard base64 decoder
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+# ONNX Runtime is optional; without it Xception runs on TensorFlow
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
+from batcher import MicroBatcher
+from buffer_pool import NpPool
+from normalize import scale_images
+
 # Import Google Drive authentication module
-from google_drive_auth import initialize_google_drive_auth, process_google_drive_image
+from google_drive_auth import (
+    initialize_google_drive_auth,
+    process_google_drive_image,
+    process_google_drive_images,
+)
 
 # Initialize the FastAPI app
 app = FastAPI(title="VEXO Image Validation API", version="1.0.0")
@@ -35,9 +72,98 @@ app.add_middleware(
 
 # Global model variables
 xception_model = None
+xception_session = None
 classification_model = None
+classification_head = None
+head_session = None
+head_interpreter = None
+# TFLite interpreters are not thread-safe; requests share the one above
+head_interpreter_lock = threading.Lock()
+fused_model = None
 model_path = "vexo_v4_2.keras"
 
+# "numpy" runs the Dense classification head as plain matmuls, "onnx" and
+# "tflite" run the int8 heads generated by export_onnx.py, "keras" keeps
+# calling the Keras model (fused into the TensorFlow Xception graph). Unset
+# means "keras" on TensorFlow and "numpy" with the ONNX Xception model.
+classifier_backend = os.getenv("CLASSIFIER_BACKEND")
+head_onnx_path = os.getenv("HEAD_ONNX_PATH", "head.int8.onnx")
+head_tflite_path = os.getenv("HEAD_TFLITE_PATH", "head.int8.tflite")
+
+# Half-precision activations only pay off on GPUs with tensor cores; on CPU
+# float16 is emulated and slower than float32. On GPU the fused graph also
+# takes float16 input, halving host-to-device copies.
+gpu_available = bool(tf.config.list_physical_devices("GPU"))
+fused_input_dtype = np.float16 if gpu_available else np.float32
+
+# XLA compilation of the Xception graphs is likewise GPU-only: on CPU the
+# XLA kernels run several times slower than the plain TensorFlow graph
+use_xla = gpu_available
+
+# Int8-quantized Xception generated by export_onnx.py, used when present
+xception_onnx_path = os.getenv("XCEPTION_ONNX_PATH", "xception.int8.onnx")
+
+# Validity scores keyed by SHA-256 of uploaded bytes or "md5:<checksum>" for
+# Google Drive files, so identical images skip inference
+score_cache = LRUCache(maxsize=8192)
+
+# Largest accepted image upload; larger files are rejected with 413 while reading
+MAX_IMAGE_BYTES = int(os.getenv("MAX_INPUT_MB", "20")) * 1024 * 1024
+READ_CHUNK_SIZE = 64 * 1024
+
+# MIME types accepted without inspecting the upload
+ALLOWED_IMAGE_TYPES = frozenset(
+    {
+        "image/jpeg",
+        "image/png",
+        "image/webp",
+        "image/gif",
+        "image/bmp",
+        "image/tiff",
+    }
+)
+
+# Leading bytes of JPEG, PNG, GIF, BMP and TIFF files; WebP is a RIFF
+# container (like WAV and AVI) and is recognized by its form type instead
+IMAGE_SIGNATURES = (
+    b"\xff\xd8\xff",
+    b"\x89PNG",
+    b"GIF8",
+    b"BM",
+    b"II*\x00",
+    b"MM\x00*",
+)
+
+# Worker threads shared by FastAPI's threadpool and image decoding
+# (unset keeps anyio's default of 40)
+thread_pool_size = os.getenv("THREAD_POOL_SIZE")
+
+# Threads used inside one op (0 lets TensorFlow pick) and ops run concurrently;
+# the intra-op count is also used for the ONNX Runtime and TFLite backends
+tf_intra_threads = int(os.getenv("TF_INTRA", "0"))
+tf_inter_threads = int(os.getenv("TF_INTER", "2"))
+
+# Concurrent single-image requests are coalesced into batches of up to
+# MAX_BATCH images, waiting at most MAX_DELAY_MS after the first one arrives
+MAX_BATCH = int(os.getenv("MAX_BATCH", "16"))
+MAX_DELAY_MS = float(os.getenv("MAX_DELAY_MS", "5"))
+
+# Resized uint8 images kept for reuse by single-image uploads, one per
+# request expected to be in flight at once
+MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", "64"))
+image_pool = NpPool((299, 299, 3), np.uint8, MAX_CONCURRENT_REQUESTS)
+
+# XLA compiles the fused graph once per batch shape, so with XLA on batches
+# are padded up to one of these sizes and all of them are compiled during warm-up
+XLA_BATCH_BUCKETS = (1, 2, 4, 8, 16, 32)
+
+# Images per forward pass when scoring multi-image, Excel, zip and Drive batches
+PREDICT_CHUNK_SIZE = XLA_BATCH_BUCKETS[-1]
+
+# Float32 batch buffers those forward passes are scaled into (~34 MB each),
+# one per batch request expected to be scored at once
+batch_pool = NpPool((PREDICT_CHUNK_SIZE, 299, 299, 3), np.float32, 4)
+
 
 # Pydantic models
 class GoogleDriveRequest(BaseModel):
@@ -48,13 +174,47 @@ class GoogleDriveMultipleRequest(BaseModel):
     drive_urls: List[str]
 
 
+def load_onnx_session(path):
+    """
+    Create an ONNX Runtime CPU session, or return None if the model cannot be loaded
+
+    An exported model that ONNX Runtime rejects (e.g. for an operator the CPU
+    provider does not implement) falls back to TensorFlow instead of
+    keeping the server from starting.
+    """
+    sess_options = ort.SessionOptions()
+    sess_options.intra_op_num_threads = tf_intra_threads or os.cpu_count()
+    try:
+        return ort.InferenceSession(
+            path,
+            sess_options=sess_options,
+            providers=["CPUExecutionProvider"],
+        )
+    except Exception as e:
+        print(f"Could not load {path}: {e}")
+        return None
+
+
 def initialize_models():
     """Initialize the models once at startup"""
-    global xception_model, classification_model
+    global xception_model, xception_session
+    global classification_model, classification_head, head_session, fused_model
+    global head_interpreter
 
     try:
-        print("Loading Xception model...")
-        xception_model = Xception(weights="imagenet", include_top=False, pooling="avg")
+        if ort is not None and os.path.exists(xception_onnx_path):
+            print(f"Loading Xception ONNX model from {xception_onnx_path}...")
+            xception_session = load_onnx_session(xception_onnx_path)
+
+        if xception_session is None:
+            if gpu_available:
+                print("GPU detected, enabling mixed_float16 policy for Xception...")
+                mixed_precision.set_global_policy("mixed_float16")
+
+            print("Loading Xception model...")
+            xception_model = Xception(
+                weights="imagenet", include_top=False, pooling="avg"
+            )
 
         print("Loading classification model...")
         if os.path.exists(model_path):
@@ -65,6 +225,44 @@ def initialize_models():
                 "Model file 'vexo_v4_2.keras' not found. Please ensure the model file exists in the current directory."
             )
 
+        backend = classifier_backend or (
+            "keras" if xception_model is not None else "numpy"
+        )
+
+        # With the Keras head on TensorFlow, chain Xception into it so one
+        # graph call scores an image; other heads run on Xception's features
+        if xception_model is not None and backend == "keras":
+            inputs = Input((299, 299, 3), dtype=fused_input_dtype)
+            outputs = classification_model(xception_model(inputs))
+            fused_model = Model(inputs, outputs, name="vexo_fused")
+            print("Running Xception and classification head as one fused graph")
+        elif backend == "onnx":
+            if ort is not None and os.path.exists(head_onnx_path):
+                print(f"Loading classification head from {head_onnx_path}...")
+                head_session = load_onnx_session(head_onnx_path)
+            if head_session is None:
+                print(f"{head_onnx_path} unavailable, using Keras classification head")
+        elif backend == "tflite":
+            if os.path.exists(head_tflite_path):
+                print(f"Loading classification head from {head_tflite_path}...")
+                head_interpreter = tf.lite.Interpreter(
+                    model_path=head_tflite_path,
+                    num_threads=tf_intra_threads or os.cpu_count(),
+                )
+                head_interpreter.allocate_tensors()
+            else:
+                print(
+                    f"{head_tflite_path} unavailable, using Keras classification head"
+                )
+        elif backend == "numpy":
+            classification_head = build_numpy_head(classification_model)
+            if classification_head is None:
+                print("Classification model has unsupported layers, using Keras")
+            else:
+                print("Running classification head with numpy")
+
+        warm_up_models()
+
         print("Models loaded successfully!")
 
     except Exception as e:
@@ -72,88 +270,417 @@ def initialize_models():
         raise e
 
 
-def load_and_preprocess_image(image_array=None, pil_image=None):
+# Smallest side images are decoded at before resizing: JPEGs are downscaled in
+# the decoder (DCT scaling) to no less than twice the model input size
+DECODE_MIN_SIZE = 2 * 299
+
+# EXIF orientation is ignored on every decode path, as PIL does, so a
+# given file always produces the same pixels
+DECODE_FLAG = cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION
+
+# OpenCV reduced-resolution decode flags, largest reduction first
+REDUCED_READ_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8 | cv2.IMREAD_IGNORE_ORIENTATION),
+    (4, cv2.IMREAD_REDUCED_COLOR_4 | cv2.IMREAD_IGNORE_ORIENTATION),
+    (2, cv2.IMREAD_REDUCED_COLOR_2 | cv2.IMREAD_IGNORE_ORIENTATION),
+)
+
+
+def reduced_read_flag(header):
     """
-    Load and preprocess image from various sources
+    Pick the cheapest cv2.imdecode flag that keeps both sides >= DECODE_MIN_SIZE
+
+    Only JPEG decoders can downscale while decoding; other formats (and
+    unparsable headers) are read at full size.
     """
-    if image_array is not None:
-        x = cv2.resize(image_array, (299, 299))
-    elif pil_image is not None:
-        # Convert PIL image to numpy array (RGB to BGR for OpenCV)
-        img_array = np.array(pil_image)
-        if len(img_array.shape) == 3 and img_array.shape[2] == 3:
-            img_array = cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
-        x = cv2.resize(img_array, (299, 299))
-    else:
-        raise ValueError("Either image_array or pil_image must be provided.")
+    if header is None or header.format != "JPEG":
+        return DECODE_FLAG
 
-    x = np.expand_dims(x, axis=0)
-    x = preprocess_input(x)
-    return x
+    width, height = header.size
+    for factor, flag in REDUCED_READ_FLAGS:
+        if min(width, height) // factor >= DECODE_MIN_SIZE:
+            return flag
+    return DECODE_FLAG
 
 
-def extract_features(image_array=None, pil_image=None):
+def open_header(contents):
     """
-    Extract features using the Xception model
+    Parse the image header with PIL without decoding pixel data, or return None
+
+    Images with more than Image.MAX_IMAGE_PIXELS pixels raise
+    Image.DecompressionBombError instead, before anything is decoded.
     """
-    if xception_model is None:
-        raise RuntimeError("Xception model not initialized")
+    try:
+        header = Image.open(io.BytesIO(contents))
+    except Image.DecompressionBombError:
+        raise
+    except Exception:
+        return None
+
+    width, height = header.size
+    if Image.MAX_IMAGE_PIXELS and width * height > Image.MAX_IMAGE_PIXELS:
+        header.close()
+        raise Image.DecompressionBombError(
+            f"Image size ({width * height} pixels) exceeds limit of "
+            f"{Image.MAX_IMAGE_PIXELS} pixels"
+        )
+    return header
 
-    if pil_image is not None:
-        img = load_and_preprocess_image(pil_image=pil_image)
-    elif image_array is not None:
-        img = load_and_preprocess_image(image_array=image_array)
-    else:
-        raise ValueError("One of pil_image or image_array must be provided")
 
-    features = xception_model.predict(img)
-    return features
+def decode_and_resize(contents, out=None):
+    """
+    Decode raw image bytes into a resized (299, 299, 3) uint8 BGR array
+
+    Every endpoint decodes through this function, so the same bytes always
+    give the same pixels and share one score_cache entry. OpenCV decodes and
+    resizes in native code; formats it cannot decode (such as GIF) are
+    decoded by PIL from the already parsed header, swapped to BGR and go
+    through the same resize. A preallocated out array is filled in place instead of
+    allocating a new one.
+    """
+    header = open_header(contents)
+    try:
+        x = cv2.imdecode(np.frombuffer(contents, np.uint8), reduced_read_flag(header))
+        if x is None:
+            if header is None:
+                raise ValueError("Unsupported image format")
+            x = cv2.cvtColor(np.asarray(header.convert("RGB")), cv2.COLOR_RGB2BGR)
+    finally:
+        if header is not None:
+            header.close()
+
+    # The classification head has only ever been validated on BGR input
+    # resized with cv2's default bilinear filter, so keep both until it is
+    # re-validated on anything else
+    return cv2.resize(x, (299, 299), dst=out, interpolation=cv2.INTER_LINEAR)
+
+
+# Direct graph calls skip the Dataset/callback machinery of .predict(); on GPU
+# XLA fuses the Xception conv/batch-norm/activation chains into fewer kernels.
+# The fixed input signatures keep one trace for every batch size.
+@tf.function(
+    jit_compile=use_xla,
+    input_signature=[tf.TensorSpec((None, 299, 299, 3), fused_input_dtype)],
+)
+def _fused(x):
+    return tf.cast(fused_model(x, training=False), tf.float32)
+
+
+@tf.function(
+    jit_compile=use_xla,
+    input_signature=[tf.TensorSpec((None, 299, 299, 3), tf.float32)],
+)
+def _extract(x):
+    x = tf.cast(x, xception_model.compute_dtype)
+    return tf.cast(xception_model(x, training=False), tf.float32)
+
 
+@tf.function(input_signature=[tf.TensorSpec((None, 2048), tf.float32)])
+def _classify(features):
+    return classification_model(features, training=False)
 
-def predict_image_validity(features):
+
+def _sigmoid(x):
+    # tanh form is numerically stable for large |x|
+    return 0.5 * (1.0 + np.tanh(0.5 * x))
+
+
+_NUMPY_ACTIVATIONS = {
+    "linear": lambda x: x,
+    "relu": lambda x: np.maximum(x, 0.0),
+    "sigmoid": _sigmoid,
+    "tanh": np.tanh,
+}
+
+
+def build_numpy_head(model):
     """
-    Predict if an image is valid using the classification model
+    Extract (kernel, bias, activation) triples from the classification model
+
+    Inference-mode BatchNormalization is an affine transform and is folded into
+    the Dense layer that follows it; Dropout is a no-op at inference. Returns
+    None for any other layer type or for activations without a numpy equivalent.
     """
-    if classification_model is None:
-        raise RuntimeError("Classification model not initialized")
+    head = []
+    pending_scale, pending_shift = None, None
 
-    features = np.squeeze(features)
-    score = classification_model.predict(np.expand_dims(features, axis=0))[0][0]
-    return float(score)
+    for layer in model.layers:
+        layer_type = type(layer).__name__
+        config = layer.get_config()
+        weights = layer.get_weights()
 
+        if layer_type in ("InputLayer", "Dropout"):
+            continue
 
-async def process_uploaded_image(file: UploadFile):
+        if layer_type == "BatchNormalization":
+            if pending_scale is not None or config.get("axis") not in (-1, [-1], 1):
+                return None
+            gamma = weights.pop(0) if config.get("scale", True) else 1.0
+            beta = weights.pop(0) if config.get("center", True) else 0.0
+            moving_mean, moving_variance = weights
+            pending_scale = gamma / np.sqrt(moving_variance + config["epsilon"])
+            pending_shift = beta - moving_mean * pending_scale
+            continue
+
+        if layer_type != "Dense":
+            return None
+
+        activation = config.get("activation")
+        if not isinstance(activation, str) or activation not in _NUMPY_ACTIVATIONS:
+            return None
+
+        kernel = weights[0]
+        if len(weights) > 1:
+            bias = weights[1]
+        else:
+            bias = np.zeros(kernel.shape[1], dtype=kernel.dtype)
+
+        # (x * scale + shift) @ W + b == x @ (scale[:, None] * W) + (shift @ W + b)
+        if pending_scale is not None:
+            bias = pending_shift @ kernel + bias
+            kernel = pending_scale[:, None] * kernel
+            pending_scale, pending_shift = None, None
+
+        head.append(
+            (
+                kernel.astype(np.float32),
+                bias.astype(np.float32),
+                _NUMPY_ACTIVATIONS[activation],
+            )
+        )
+
+    if pending_scale is not None:
+        return None
+
+    return head or None
+
+
+def run_tflite_head(features):
     """
-    Process an uploaded image file and return validation results
+    Score (N, 2048) Xception features with the TFLite classification head
     """
-    try:
-        # Read the uploaded file
-        contents = await file.read()
+    x = np.asarray(features, dtype=np.float32)
+
+    with head_interpreter_lock:
+        input_details = head_interpreter.get_input_details()[0]
+        if tuple(input_details["shape"]) != x.shape:
+            head_interpreter.resize_tensor_input(input_details["index"], x.shape)
+            head_interpreter.allocate_tensors()
+
+        head_interpreter.set_tensor(input_details["index"], x)
+        head_interpreter.invoke()
+        output_index = head_interpreter.get_output_details()[0]["index"]
+        return head_interpreter.get_tensor(output_index).ravel()
 
-        # Convert to PIL Image
-        pil_image = Image.open(io.BytesIO(contents))
 
-        # Convert to RGB if necessary
-        if pil_image.mode != "RGB":
-            pil_image = pil_image.convert("RGB")
+def classify_features(features):
+    """
+    Score (N, 2048) Xception features with the classification head, returning (N,)
+    """
+    if head_session is not None:
+        input_name = head_session.get_inputs()[0].name
+        features = np.asarray(features, dtype=np.float32)
+        return head_session.run(None, {input_name: features})[0].ravel()
+
+    if head_interpreter is not None:
+        return run_tflite_head(features)
+
+    if classification_head is not None:
+        x = np.asarray(features, dtype=np.float32)
+        for kernel, bias, activation in classification_head:
+            x = activation(x @ kernel + bias)
+        return x.ravel()
+
+    return _classify(features).numpy().astype(np.float32).ravel()
+
+
+def warm_up_models():
+    """
+    Run dummy batches through the models so tracing and compilation
+    happen at startup instead of on the first request
+    """
+    # The XLA-compiled TensorFlow Xception needs one compilation per batch
+    # bucket; plain TensorFlow graphs and ONNX Runtime handle any batch size
+    # once traced, so one small batch is enough
+    xla_compiled = xception_model is not None and use_xla
+    batch_sizes = XLA_BATCH_BUCKETS if xla_compiled else (1,)
+    for batch_size in batch_sizes:
+        print(f"Warming up models with batch size {batch_size}...")
+        predict_batch(np.zeros((batch_size, 299, 299, 3), dtype=np.float32))
+
+    # Compile the numba scaling kernel (when installed) before the first request
+    scale_images(np.zeros((1, 299, 299, 3), dtype=np.uint8))
+
+
+def run_xception(x):
+    """
+    Run the Xception backbone on a preprocessed batch with the loaded backend
+    """
+    if xception_session is not None:
+        input_name = xception_session.get_inputs()[0].name
+        return xception_session.run(
+            None, {input_name: np.asarray(x, dtype=np.float32)}
+        )[0]
+
+    return _extract(x)
+
+
+def predict_batch(batch):
+    """
+    Predict validity scores for a preprocessed (N, 299, 299, 3) batch in a single forward pass
+    """
+    if (xception_model is None and xception_session is None) or (
+        classification_model is None
+    ):
+        raise RuntimeError("Models not initialized")
+
+    if xception_session is not None:
+        return classify_features(run_xception(batch))
+
+    n = len(batch)
+    batch = np.asarray(
+        batch, dtype=fused_input_dtype if fused_model is not None else np.float32
+    )
+    # Pad to the next compiled bucket so XLA never recompiles mid-request
+    # (on the host, before the batch is copied to the device). Without XLA
+    # the padding would only be wasted compute.
+    bucket = n
+    if use_xla:
+        bucket = next((size for size in XLA_BATCH_BUCKETS if size >= n), n)
+    if bucket != n:
+        padding = np.zeros((bucket - n,) + batch.shape[1:], dtype=batch.dtype)
+        batch = np.concatenate([batch, padding])
+
+    if fused_model is not None:
+        return _fused(batch).numpy().ravel()[:n]
+    return classify_features(run_xception(batch)[:n])
+
+
+def predict_resized_images(images):
+    """
+    Predict validity scores for resized (299, 299, 3) uint8 BGR images
 
-        # Extract features
-        features = extract_features(pil_image=pil_image)
+    Each PREDICT_CHUNK_SIZE slice is scaled into one pooled float32 batch
+    buffer, so memory no longer grows with the number of images.
+    """
+    scores = []
+    with batch_pool.borrow() as buf:
+        for start in range(0, len(images), PREDICT_CHUNK_SIZE):
+            chunk = np.stack(images[start : start + PREDICT_CHUNK_SIZE])
+            scores.extend(predict_batch(scale_images(chunk, out=buf[: len(chunk)])))
+    return [float(score) for score in scores]
 
-        # Get prediction score
-        score = predict_image_validity(features)
 
-        # Determine validity
-        is_valid = score >= 0.5
+def predict_image(contents):
+    """
+    Predict the validity score of a single encoded image file
+    """
+    return predict_resized_images([decode_and_resize(contents)])[0]
 
-        return {
-            "filename": file.filename,
-            "validity_score": score,
-            "percentage": score * 100,
-            "is_valid": is_valid,
-            "message": "Image is valid" if is_valid else "Image is not valid",
-        }
 
+def predict_encoded_images(contents_list):
+    """
+    Predict validity scores for a list of encoded image files
+    """
+    return predict_resized_images([decode_and_resize(c) for c in contents_list])
+
+
+# Shared by all /validate* uploads; started in startup_event
+inference_batcher = MicroBatcher(
+    predict_batch, max_batch_size=MAX_BATCH, max_delay_ms=MAX_DELAY_MS
+)
+
+
+def build_validation_result(filename, score):
+    """
+    Build the validation response payload for a single image
+    """
+    score = float(score)
+    is_valid = score >= 0.5
+
+    return {
+        "filename": filename,
+        "validity_score": score,
+        "percentage": score * 100,
+        "is_valid": is_valid,
+        "message": "Image is valid" if is_valid else "Image is not valid",
+    }
+
+
+def is_image_upload(file: UploadFile, contents: bytes):
+    """
+    Check whether an upload is an image by MIME type, falling back to the
+    leading bytes of its contents for clients that send e.g.
+    application/octet-stream
+    """
+    if file.content_type in ALLOWED_IMAGE_TYPES:
+        return True
+
+    if contents.startswith(b"RIFF"):
+        return contents[8:12] == b"WEBP"
+    return contents.startswith(IMAGE_SIGNATURES)
+
+
+def file_too_large_error(cap):
+    """
+    Build the 413 error returned for uploads larger than cap bytes
+    """
+    return HTTPException(
+        status_code=413,
+        detail=f"File too large. Maximum size is {cap // (1024 * 1024)} MB",
+    )
+
+
+def read_capped(fileobj, cap):
+    """
+    Read a file object in chunks, failing as soon as it grows past cap bytes
+    """
+    buffer = io.BytesIO()
+    while chunk := fileobj.read(READ_CHUNK_SIZE):
+        buffer.write(chunk)
+        if buffer.tell() > cap:
+            raise file_too_large_error(cap)
+    return buffer.getvalue()
+
+
+async def read_upload(file: UploadFile, cap=MAX_IMAGE_BYTES):
+    """
+    Read an uploaded image without ever holding more than cap bytes in memory
+    """
+    if file.size is not None and file.size > cap:
+        raise file_too_large_error(cap)
+
+    # UploadFile spools large bodies to disk, so read off the event loop
+    return await run_in_threadpool(read_capped, file.file, cap)
+
+
+async def process_uploaded_image(file: UploadFile):
+    """
+    Process an uploaded image file and return validation results
+    """
+    try:
+        # Read the uploaded file
+        contents = await read_upload(file)
+        if not is_image_upload(file, contents):
+            raise HTTPException(status_code=400, detail="File must be an image")
+
+        # Return the cached score if this exact image was validated before
+        digest = hashlib.sha256(contents).digest()
+        if digest in score_cache:
+            return build_validation_result(file.filename, score_cache[digest])
+
+        # Decode off the event loop into a pooled buffer, then score together
+        # with concurrent uploads; the batcher has copied the pixels into its
+        # batch buffer by the time the score comes back
+        with image_pool.borrow() as buf:
+            await run_in_threadpool(decode_and_resize, contents, buf)
+            score = await inference_batcher.predict(buf)
+        score_cache[digest] = score
+
+        return build_validation_result(file.filename, score)
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error processing image: {str(e)}")
 
@@ -162,7 +689,21 @@ async def process_uploaded_image(file: UploadFile):
 @app.on_event("startup")
 async def startup_event():
     """Initialize models and Google Drive authentication when the API starts"""
+    if thread_pool_size:
+        to_thread.current_default_thread_limiter().total_tokens = int(thread_pool_size)
+
+    # Must run before TensorFlow executes its first op
+    tf.config.threading.set_intra_op_parallelism_threads(tf_intra_threads)
+    tf.config.threading.set_inter_op_parallelism_threads(tf_inter_threads)
+
+    # JPEG decode speed depends on the libjpeg Pillow was built against
+    if pil_features.check_feature("libjpeg_turbo"):
+        print("Pillow is using libjpeg-turbo for JPEG decoding")
+    else:
+        print("Pillow is not using libjpeg-turbo - JPEG decoding will be slower")
+
     initialize_models()
+    inference_batcher.start()
 
     # Initialize Google Drive authentication (optional - will work without it)
     try:
@@ -178,6 +719,12 @@ async def startup_event():
         print("Google Drive features will be unavailable")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the inference batcher when the API shuts down"""
+    await inference_batcher.stop()
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API information"""
@@ -199,7 +746,9 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    models_loaded = xception_model is not None and classification_model is not None
+    models_loaded = (
+        xception_model is not None or xception_session is not None
+    ) and classification_model is not None
     return {
         "status": "healthy" if models_loaded else "unhealthy",
         "models_loaded": models_loaded,
@@ -211,9 +760,6 @@ async def validate_single_image(file: UploadFile = File(...)):
     """
     Validate a single uploaded image
     """
-    if not file.content_type.startswith("image/"):
-        raise HTTPException(status_code=400, detail="File must be an image")
-
     result = await process_uploaded_image(file)
     return JSONResponse(content=result)
 
@@ -223,29 +769,163 @@ async def validate_multiple_images(files: List[UploadFile] = File(...)):
     """
     Validate multiple uploaded images
     """
-    if len(files) > 100:  # Limit to 10 files per request
+    if len(files) > 100:  # Limit to 100 files per request
         raise HTTPException(
-            status_code=400, detail="Maximum 10 files allowed per request"
+            status_code=400, detail="Maximum 100 files allowed per request"
         )
 
-    results = []
+    results = [None] * len(files)
+
+    async def _prepare(file):
+        contents = await read_upload(file)
+        if not is_image_upload(file, contents):
+            raise HTTPException(status_code=400, detail="File must be an image")
+        digest = hashlib.sha256(contents).digest()
+        cached_score = score_cache.get(digest)
+        if cached_score is not None:
+            return digest, None, cached_score
+        image = await run_in_threadpool(decode_and_resize, contents)
+        return digest, image, None
+
+    # Read, check and decode every image concurrently on the threadpool
+    images = await asyncio.gather(
+        *[_prepare(file) for file in files],
+        return_exceptions=True,
+    )
+
+    batch_images = []
+    batch_indices = []
+    batch_digests = []
+    for index, prepared in enumerate(images):
+        if isinstance(prepared, HTTPException):
+            results[index] = {
+                "filename": files[index].filename,
+                "error": prepared.detail,
+            }
+            continue
+        if isinstance(prepared, Exception):
+            results[index] = {
+                "filename": files[index].filename,
+                "error": f"Error processing image: {str(prepared)}",
+            }
+            continue
 
-    for file in files:
-        if not file.content_type.startswith("image/"):
-            results.append(
-                {"filename": file.filename, "error": "File must be an image"}
+        digest, image, cached_score = prepared
+        if cached_score is not None:
+            results[index] = build_validation_result(
+                files[index].filename, cached_score
             )
             continue
 
+        batch_images.append(image)
+        batch_indices.append(index)
+        batch_digests.append(digest)
+
+    # Score all decoded images in batched forward passes
+    if batch_indices:
         try:
-            result = await process_uploaded_image(file)
-            results.append(result)
-        except HTTPException as e:
-            results.append({"filename": file.filename, "error": e.detail})
+            scores = await run_in_threadpool(predict_resized_images, batch_images)
+            for index, digest, score in zip(batch_indices, batch_digests, scores):
+                score_cache[digest] = float(score)
+                results[index] = build_validation_result(files[index].filename, score)
+        except Exception as e:
+            for index in batch_indices:
+                results[index] = {
+                    "filename": files[index].filename,
+                    "error": f"Error processing image: {str(e)}",
+                }
 
     return JSONResponse(content={"results": results})
 
 
+def read_excel_rows(fileobj, filename):
+    """
+    Read the header and data rows of the first worksheet of an Excel file
+
+    .xlsx files are streamed with openpyxl in read-only mode; legacy .xls
+    files go through pandas, which needs xlrd installed.
+    """
+    if filename.endswith(".xls"):
+        df = pd.read_excel(fileobj)
+        df = df.astype(object).where(pd.notna(df), None)
+        return [str(col) for col in df.columns], [
+            tuple(row) for row in df.itertuples(index=False)
+        ]
+
+    workbook = openpyxl.load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        values = workbook.worksheets[0].iter_rows(values_only=True)
+        header = list(next(values, ()))
+        # Skip fully empty rows, as pandas does
+        rows = [row for row in values if any(cell is not None for cell in row)]
+    finally:
+        workbook.close()
+
+    # Rows may be shorter than the header when trailing cells are empty
+    width = len(header)
+    rows = [tuple(row[:width]) + (None,) * (width - len(row)) for row in rows]
+    return header, rows
+
+
+def write_excel_rows(header, rows, notes):
+    """
+    Write rows plus their NOTES column to a new .xlsx workbook in memory
+    """
+    # Replace an existing NOTES column rather than adding a second one
+    if "NOTES" in header:
+        notes_column = header.index("NOTES")
+    else:
+        notes_column = len(header)
+        header = header + ["NOTES"]
+
+    workbook = openpyxl.Workbook(write_only=True)
+    worksheet = workbook.create_sheet("Processed Data")
+    worksheet.append(header)
+    for row, note in zip(rows, notes):
+        row = list(row)
+        if notes_column == len(row):
+            row.append(note)
+        else:
+            row[notes_column] = note
+        worksheet.append(row)
+
+    output_buffer = io.BytesIO()
+    workbook.save(output_buffer)
+    output_buffer.seek(0)
+    return output_buffer
+
+
+def decode_selfie(selfie_data):
+    """
+    Decode one SELFIE cell into a resized image
+
+    Returns:
+        tuple: (image, None), or (None, note) when the cell holds no usable image
+    """
+    if selfie_data is None or selfie_data == "":
+        return None, "No image provided"
+
+    # Assume SELFIE column contains base64 encoded images or file paths
+    # For base64 images
+    if isinstance(selfie_data, str) and selfie_data.startswith("data:image"):
+        # Extract base64 data
+        base64_data = selfie_data.rpartition(",")[2]
+        image_bytes = base64.b64decode(base64_data)
+    elif isinstance(selfie_data, str):
+        # Treat as base64 without prefix
+        try:
+            image_bytes = base64.b64decode(selfie_data)
+        except:
+            return None, "Invalid image format"
+    else:
+        return None, "Invalid image format"
+
+    if len(image_bytes) > MAX_IMAGE_BYTES:
+        return None, file_too_large_error(MAX_IMAGE_BYTES).detail
+
+    return decode_and_resize(image_bytes), None
+
+
 @app.post("/process_excel")
 async def process_excel_file(file: UploadFile = File(...)):
     """
@@ -257,9 +937,10 @@ async def process_excel_file(file: UploadFile = File(...)):
         )
 
     try:
-        # Read Excel file
-        contents = await file.read()
-        df = pd.read_excel(io.BytesIO(contents))
+        # Read the Excel file straight from the spooled upload, without a copy
+        header, rows = await run_in_threadpool(
+            read_excel_rows, file.file, file.filename
+        )
 
         # Validate required columns
         required_columns = [
@@ -271,7 +952,7 @@ async def process_excel_file(file: UploadFile = File(...)):
             "KTP",
             "SELFIE",
         ]
-        missing_columns = [col for col in required_columns if col not in df.columns]
+        missing_columns = [col for col in required_columns if col not in header]
 
         if missing_columns:
             raise HTTPException(
@@ -279,71 +960,63 @@ async def process_excel_file(file: UploadFile = File(...)):
                 detail=f"Missing required columns: {', '.join(missing_columns)}",
             )
 
-        # Add NOTES column
-        df["NOTES"] = ""
-
-        # Process each row's SELFIE image
-        for index, row in df.iterrows():
-            try:
-                selfie_data = row["SELFIE"]
+        selfie_column = header.index("SELFIE")
+        notes = [""] * len(rows)
+
+        async def _score_rows(window):
+            # Decode the window's SELFIE images concurrently on the threadpool
+            decoded = await asyncio.gather(
+                *[
+                    run_in_threadpool(decode_selfie, rows[index][selfie_column])
+                    for index in window
+                ],
+                return_exceptions=True,
+            )
 
-                if pd.isna(selfie_data) or selfie_data == "":
-                    df.at[index, "NOTES"] = "No image provided"
+            images = []
+            image_rows = []
+            for index, result in zip(window, decoded):
+                if isinstance(result, Exception):
+                    notes[index] = f"Error processing image: {str(result)}"
                     continue
 
-                # Assume SELFIE column contains base64 encoded images or file paths
-                # For base64 images
-                if isinstance(selfie_data, str) and selfie_data.startswith(
-                    "data:image"
-                ):
-                    # Extract base64 data
-                    base64_data = (
-                        selfie_data.split(",")[1] if "," in selfie_data else selfie_data
-                    )
-                    image_bytes = base64.b64decode(base64_data)
-                elif isinstance(selfie_data, str):
-                    # Treat as base64 without prefix
-                    try:
-                        image_bytes = base64.b64decode(selfie_data)
-                    except:
-                        df.at[index, "NOTES"] = "Invalid image format"
-                        continue
-                else:
-                    df.at[index, "NOTES"] = "Invalid image format"
+                image, note = result
+                if image is None:
+                    notes[index] = note
                     continue
 
-                # Convert to PIL Image
-                pil_image = Image.open(io.BytesIO(image_bytes))
+                images.append(image)
+                image_rows.append(index)
 
-                # Convert to RGB if necessary
-                if pil_image.mode != "RGB":
-                    pil_image = pil_image.convert("RGB")
+            if not image_rows:
+                return
 
-                # Extract features and predict
-                features = extract_features(pil_image=pil_image)
-                score = predict_image_validity(features)
-                is_valid = score >= 0.5
+            try:
+                scores = await run_in_threadpool(predict_resized_images, images)
+            except Exception as e:
+                for index in image_rows:
+                    notes[index] = f"Error processing image: {str(e)}"
+                return
 
+            for index, score in zip(image_rows, scores):
                 # Set notes based on validation result
                 percentage = score * 100
-                if is_valid:
-                    df.at[index, "NOTES"] = f"VALID - Score: {percentage:.1f}%"
+                if score >= 0.5:
+                    notes[index] = f"VALID - Score: {percentage:.1f}%"
                 else:
-                    df.at[index, "NOTES"] = f"INVALID - Score: {percentage:.1f}%"
+                    notes[index] = f"INVALID - Score: {percentage:.1f}%"
 
-            except Exception as e:
-                df.at[index, "NOTES"] = f"Error processing image: {str(e)}"
-
-        # Convert dataframe to Excel bytes
-        output_buffer = io.BytesIO()
-        with pd.ExcelWriter(output_buffer, engine="openpyxl") as writer:
-            df.to_excel(writer, index=False, sheet_name="Processed Data")
+        # Decode and score PREDICT_CHUNK_SIZE rows at a time, so only one
+        # window of decoded images is held in memory
+        for start in range(0, len(rows), PREDICT_CHUNK_SIZE):
+            await _score_rows(range(start, min(start + PREDICT_CHUNK_SIZE, len(rows))))
 
-        output_buffer.seek(0)
+        # Stream the rows with their NOTES into a new workbook
+        output_buffer = await run_in_threadpool(write_excel_rows, header, rows, notes)
 
         # Return Excel file
         return StreamingResponse(
-            io.BytesIO(output_buffer.getvalue()),
+            output_buffer,
             media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             headers={
                 "Content-Disposition": f"attachment; filename=processed_{file.filename}"
@@ -365,55 +1038,50 @@ async def upload_zip_file(file: UploadFile = File(...)):
         raise HTTPException(status_code=400, detail="File must be a zip archive")
 
     try:
-        # Create a temporary directory
-        with tempfile.TemporaryDirectory() as tmpdirname:
-            # Save the uploaded zip file
-            zip_path = os.path.join(tmpdirname, "uploaded.zip")
-            with open(zip_path, "wb") as zip_file:
-                zip_file.write(await file.read())
-
-            # Extract the zip file
-            with zipfile.ZipFile(zip_path, "r") as zip_ref:
-                zip_ref.extractall(tmpdirname)
-
-                # Process each extracted file
-                results = []
-                for extracted_file in os.listdir(tmpdirname):
-                    if extracted_file.endswith(
-                        (".png", ".jpg", ".jpeg", ".bmp", ".gif")
-                    ):
-                        file_path = os.path.join(tmpdirname, extracted_file)
-
-                        # Read and validate the image
-                        with open(file_path, "rb") as img_file:
-                            contents = img_file.read()
-                            pil_image = Image.open(io.BytesIO(contents))
-
-                            # Extract features
-                            features = extract_features(pil_image=pil_image)
-
-                            # Get prediction score
-                            score = predict_image_validity(features)
-
-                            # Determine validity
-                            is_valid = score >= 0.5
-
-                            results.append(
-                                {
-                                    "filename": extracted_file,
-                                    "validity_score": score,
-                                    "percentage": score * 100,
-                                    "is_valid": is_valid,
-                                    "message": (
-                                        "Image is valid"
-                                        if is_valid
-                                        else "Image is not valid"
-                                    ),
-                                }
-                            )
-
-                return JSONResponse(content={"results": results})
-
+        # The spooled upload is seekable, so zipfile reads entries from it directly
+        with zipfile.ZipFile(file.file) as zip_ref:
+            # Images at the top level of the archive, read straight from the zip
+            entries = [
+                info
+                for info in zip_ref.infolist()
+                if "/" not in info.filename
+                and info.filename.endswith((".png", ".jpg", ".jpeg", ".bmp", ".gif"))
+            ]
+
+            for info in entries:
+                if info.file_size > MAX_IMAGE_BYTES:
+                    raise file_too_large_error(MAX_IMAGE_BYTES)
+
+            def _decode(info):
+                return decode_and_resize(zip_ref.read(info))
+
+            # Decode and score PREDICT_CHUNK_SIZE entries at a time, so only one
+            # window of decoded images is held in memory
+            results = []
+            for start in range(0, len(entries), PREDICT_CHUNK_SIZE):
+                window = entries[start : start + PREDICT_CHUNK_SIZE]
+
+                # Decompress and decode the window concurrently on the
+                # threadpool; wait for every entry before raising, so no
+                # thread is still reading when the archive is closed
+                images = await asyncio.gather(
+                    *[run_in_threadpool(_decode, info) for info in window],
+                    return_exceptions=True,
+                )
+                for image in images:
+                    if isinstance(image, BaseException):
+                        raise image
+
+                scores = await run_in_threadpool(predict_resized_images, images)
+                results.extend(
+                    build_validation_result(info.filename, score)
+                    for info, score in zip(window, scores)
+                )
+
+        return JSONResponse(content={"results": results})
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=400, detail=f"Error processing zip file: {str(e)}"
@@ -427,7 +1095,10 @@ async def validate_google_drive_image(request: GoogleDriveRequest):
     """
     try:
         result = process_google_drive_image(
-            request.drive_url, extract_features, predict_image_validity
+            request.drive_url,
+            predict_image,
+            score_cache=score_cache,
+            max_bytes=MAX_IMAGE_BYTES,
         )
         return JSONResponse(content=result)
     except Exception as e:
@@ -446,21 +1117,17 @@ async def validate_google_drive_multiple_images(request: GoogleDriveMultipleRequ
             status_code=400, detail="Maximum 10 URLs allowed per request"
         )
 
-    results = []
-
-    for drive_url in request.drive_urls:
-        try:
-            result = process_google_drive_image(
-                drive_url, extract_features, predict_image_validity
-            )
-            results.append(result)
-        except Exception as e:
-            results.append(
-                {
-                    "drive_url": drive_url,
-                    "error": f"Error processing Google Drive image: {str(e)}",
-                }
-            )
+    try:
+        results = await process_google_drive_images(
+            request.drive_urls,
+            predict_encoded_images,
+            score_cache=score_cache,
+            max_bytes=MAX_IMAGE_BYTES,
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=400, detail=f"Error processing Google Drive images: {str(e)}"
+        )
 
     return JSONResponse(content={"results": results})
 
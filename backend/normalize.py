@@ -0,0 +1,52 @@
+"""
+Pixel scaling kernels for the VEXO API preprocessing paths
+"""
+
+import numpy as np
+
+# Numba is optional; without it the scaling runs as vectorized numpy
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+
+def _scale_numpy(images, out):
+    np.multiply(images, 1.0 / 127.5, out=out)
+    np.subtract(out, 1.0, out=out)
+    return out
+
+
+if njit is not None:
+
+    @njit(parallel=True, nogil=True, cache=True)
+    def _scale_numba(images, out):
+        n, height, width, channels = images.shape
+        for i in prange(n):
+            for y in range(height):
+                for x in range(width):
+                    for c in range(channels):
+                        out[i, y, x, c] = images[i, y, x, c] * (1.0 / 127.5) - 1.0
+        return out
+
+
+def scale_images(images: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """
+    Scale a (N, H, W, 3) uint8 batch to Xception's [-1, 1] float32 range
+
+    With numba installed, images are scaled in parallel across the batch
+    without holding the GIL.
+
+    Args:
+        images: Resized uint8 BGR images
+        out: Optional float32 array of the same shape to write into
+
+    Returns:
+        np.ndarray: The scaled float32 batch
+    """
+    if out is None:
+        out = np.empty(images.shape, dtype=np.float32)
+
+    if njit is not None and images.dtype == np.uint8:
+        return _scale_numba(images, out)
+    return _scale_numpy(images, out)
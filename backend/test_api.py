@@ -0,0 +1,142 @@
+"""
+Tests comparing the VEXO API preprocessing with the original pipeline
+"""
+
+import io
+import os
+import struct
+import zlib
+
+import cv2
+import numpy as np
+import pytest
+from keras.applications.xception import Xception, preprocess_input
+from keras.models import load_model
+from PIL import Image
+
+import main
+from normalize import scale_images
+
+
+def reference_image_bytes(fmt):
+    """Encode a deterministic 480x640 test image in the given format"""
+    rng = np.random.default_rng(0)
+    y, x = np.mgrid[0:480, 0:640]
+    pixels = np.stack([x * 255 // 639, y * 255 // 479, (x + y) % 256], axis=-1)
+    pixels = np.clip(pixels + rng.integers(-20, 21, pixels.shape), 0, 255)
+
+    buffer = io.BytesIO()
+    Image.fromarray(pixels.astype(np.uint8)).save(buffer, fmt)
+    return buffer.getvalue()
+
+
+def png_bomb(side=20000):
+    """Encode a side x side all-black grayscale PNG, a few hundred KB on disk"""
+
+    def chunk(kind, data):
+        crc = zlib.crc32(kind + data)
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", crc)
+
+    compressor = zlib.compressobj(9)
+    row = bytes(side + 1)  # filter byte plus one byte per pixel
+    idat = b"".join(compressor.compress(row) for _ in range(side))
+    idat += compressor.flush()
+    ihdr = struct.pack(">IIBBBBB", side, side, 8, 0, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", ihdr)
+        + chunk(b"IDAT", idat)
+        + chunk(b"IEND", b"")
+    )
+
+
+def baseline_preprocess(contents):
+    """Preprocess an image exactly as the original load_and_preprocess_image did"""
+    pil_image = Image.open(io.BytesIO(contents))
+    if pil_image.mode != "RGB":
+        pil_image = pil_image.convert("RGB")
+
+    img_array = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
+    x = cv2.resize(img_array, (299, 299))
+    return preprocess_input(np.expand_dims(x, axis=0))
+
+
+@pytest.mark.parametrize("fmt", ["PNG", "JPEG", "GIF"])
+def test_decode_matches_baseline_pixels(fmt):
+    contents = reference_image_bytes(fmt)
+
+    x = scale_images(main.decode_and_resize(contents)[None, ...])
+
+    # OpenCV and Pillow may bundle different libjpeg builds, which can round
+    # a decoded JPEG pixel differently by one level
+    atol = 1.5 / 127.5 if fmt == "JPEG" else 1e-6
+    np.testing.assert_allclose(x, baseline_preprocess(contents), atol=atol)
+
+
+def test_decode_rejects_decompression_bomb():
+    with pytest.raises(Image.DecompressionBombError):
+        main.decode_and_resize(png_bomb())
+
+
+@pytest.fixture(scope="module")
+def models():
+    try:
+        main.initialize_models()
+    except Exception as e:
+        pytest.skip(f"Models unavailable: {e}")
+    if main.xception_model is None:
+        pytest.skip("Baseline comparison needs the TensorFlow Xception model")
+
+
+def test_score_matches_baseline(models):
+    contents = reference_image_bytes("JPEG")
+
+    features = main.xception_model.predict(baseline_preprocess(contents))
+    baseline_score = float(main.classification_model.predict(features)[0][0])
+    score = main.predict_image(contents)
+
+    assert score == pytest.approx(baseline_score, abs=1e-3)
+    assert (score >= 0.5) == (baseline_score >= 0.5)
+
+
+def test_onnx_xception_matches_tensorflow():
+    if main.ort is None or not os.path.exists(main.xception_onnx_path):
+        pytest.skip("Needs onnxruntime and an exported Xception ONNX model")
+    try:
+        xception = Xception(weights="imagenet", include_top=False, pooling="avg")
+        head = load_model(main.model_path)
+    except Exception as e:
+        pytest.skip(f"Models unavailable: {e}")
+
+    session = main.load_onnx_session(main.xception_onnx_path)
+    assert session is not None
+
+    x = scale_images(main.decode_and_resize(reference_image_bytes("JPEG"))[None, ...])
+    onnx_features = session.run(None, {session.get_inputs()[0].name: x})[0]
+    tf_score = float(head.predict(xception.predict(x))[0][0])
+    onnx_score = float(head.predict(onnx_features)[0][0])
+
+    # The ONNX model has 8-bit quantized weights, so scores only agree closely
+    assert onnx_score == pytest.approx(tf_score, abs=0.05)
+    assert (onnx_score >= 0.5) == (tf_score >= 0.5)
+
+
+def test_tflite_head_matches_keras(tmp_path, monkeypatch):
+    import tensorflow as tf
+    from export_onnx import export_head_tflite
+
+    tflite_path = export_head_tflite(main.model_path, str(tmp_path / "head.tflite"))
+    interpreter = tf.lite.Interpreter(model_path=tflite_path)
+    interpreter.allocate_tensors()
+    monkeypatch.setattr(main, "head_interpreter", interpreter)
+    head = load_model(main.model_path)
+
+    # Non-negative like pooled Xception features, scaled to score both ways
+    features = np.random.default_rng(0).exponential(0.2, (32, 2048)).astype(np.float32)
+    tflite_scores = main.run_tflite_head(features)
+    keras_scores = head.predict(features).ravel()
+
+    assert np.isfinite(tflite_scores).all()
+    # The TFLite head has 8-bit quantized weights, which shift scores near
+    # the decision boundary by a few hundredths
+    np.testing.assert_allclose(tflite_scores, keras_scores, atol=0.1)